@@ -9,6 +9,13 @@ REQUIRED_PACKAGES = [
     'Keras >= 2.2'
 ]
 
+EXTRA_PACKAGES = {
+    'async': ['aioftp >= 0.13'],
+    'curl': ['pycurl >= 7.43'],
+    'compress': ['zstandard >= 0.15'],
+    'json': ['orjson >= 3.0'],
+}
+
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
@@ -39,5 +46,6 @@ setuptools.setup(
     include_package_data=True,
     zip_safe=False,
     install_requires=REQUIRED_PACKAGES,
+    extras_require=EXTRA_PACKAGES,
     # entry_points={'console_scripts': CONSOLE_SCRIPTS}
 )
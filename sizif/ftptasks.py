@@ -1,32 +1,58 @@
 import ftplib
+import hashlib
+import io
 import logging
+import mmap
 import os
 import platform
+import queue
+import random
 import socket
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 """
 Atomic synchronous download/upload jobs to be executed either on main or background thread
 """
 
 FTP_RETRY_COUNT = 10  # attempts to execute failed FTP operation
-FTP_RETRY_DELAY = 3  # seconds between another FTP attempt
+FTP_RETRY_DELAY = 3  # seconds before the first retry of failed FTP operation
+FTP_RETRY_BASE = 1.5  # retry delay multiplier per failed attempt
+FTP_RETRY_MAX_DELAY = 60.  # retry delay cap in seconds
 FTP_OPERATION_TIMEOUT = 70.  # seconds per single blocking socket operation
+FTP_BLOCKSIZE = 256 * 1024  # bytes per data channel read/write, ftplib default is 8 KiB
+FTP_SOCKET_BUFSIZE = 1 << 20  # SO_RCVBUF/SO_SNDBUF size for FTP sockets
+FILE_BUFSIZE = 1 << 20  # local file buffer, coalesces writes of received blocks
+FTP_PROGRESS_STEP = 1 << 20  # min bytes transferred between progress reports
+FTP_PROGRESS_INTERVAL = 0.1  # min seconds between progress prints
+FTP_MAX_CONNECTIONS = 8  # simultaneous batch connections per process, keep below server limit
+ZSTD_LEVEL = 3  # compression level of compressed transfers
+FTP_DEBUGLEVEL = int(os.environ.get('SIZIF_FTP_DEBUG', 0))  # ftplib protocol trace to stdout
 MACOS = 'darwin' in platform.system().lower()  # socket options different for macOS and Linux
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-# lh = logging.StreamHandler(sys.stdout)
-# lh.setLevel(logging.DEBUG)
-# logger.addHandler(lh)
-logger.setLevel(logging.DEBUG)
+
+# shared by all batch operations, so concurrent batches don't exceed server connections cap
+_connections = threading.BoundedSemaphore(FTP_MAX_CONNECTIONS)
 
 
 def download_task(from_filename, to_filepath, remote_folder='/',
                   host=None, port=0, login=None, password=None,
                   die_on_ftperrors=False,
                   verbose=0,
-                  ftp=None):
+                  ftp=None,
+                  pool=None,
+                  compressed=False,
+                  sha256=None,
+                  blocksize=FTP_BLOCKSIZE):
     """
     Download with resume/reconnect support over ftplib.
     Local file will be rewritten.
@@ -41,60 +67,104 @@ def download_task(from_filename, to_filepath, remote_folder='/',
     :param login: FTP login
     :param password: FTP password
     :param die_on_ftperrors: True — reraise ftplib errors, False - just log and return last exception
-    :param verbose: ftplib verbosity option
+    :param verbose: 1 - print progress % to stdout. ftplib protocol trace is printed only if
+            SIZIF_FTP_DEBUG env variable is set (1 or 2 as ftplib debug level)
     :param ftp: FTP() instance to operate on, if None - new created and closed after download complete
+    :param pool: :py:class:`FTPConnectionPool` to take connection from instead of creating new one,
+            connection is returned to the pool after download complete
+    :param compressed: download `from_filename`.zst uploaded with compressed=True and decompress it
+            on the fly. Requires `zstandard` package, compressed download can't be resumed -
+            restarted from the beginning on errors.
+    :param sha256: expected hex digest of the file, computed on the fly while transferring.
+            Mismatch is reported as ValueError same way as FTP errors. Not supported for
+            compressed transfers.
+    :param blocksize: bytes per data channel read/write, larger means fewer syscalls
 
     :return (True, None) on successfull download, (False, exception) of last error on failed download
-            Exception is raised immediately if die_on_ftperrors == True
+            Exception is raised immediately if die_on_ftperrors == True.
+            Permanent FTP errors (ftplib.error_perm) are not retried.
     """
-    logger.info(f'Downloading from {from_filename} to {to_filepath}')
-    ftpw = FTPWrapper(remote_folder, host, port, login, password, verbose, ftp)
+    if compressed:
+        _require_zstandard()
+        _forbid_sha256(sha256)
+        from_filename += '.zst'
+
+    logger.info('Downloading from %s to %s', from_filename, to_filepath)
     exception = None
 
-    with open(to_filepath, 'w+b') as f:
+    with open(to_filepath, 'w+b', buffering=FILE_BUFSIZE) as f:
+        # local file first, so its errors don't take a connection from the pool
+        ftpw = pool.acquire(remote_folder, host, port, login, password, verbose) if pool \
+            else FTPWrapper(remote_folder, host, port, login, password, verbose, ftp)
         attempts = FTP_RETRY_COUNT
         downloading = True
-        logger.debug(f'Downloading {from_filename} to {to_filepath}...')
-
-        while downloading:
-            try:
-                ftpw.connect()
-                ftpw.ftp.voidcmd('TYPE I')
-                target_size = ftpw.ftp.size(from_filename)
-                tracker = ProgressTracker(target_size, f.tell(), verbose)
-
-                def write_progress(block):
-                    f.write(block)
-                    tracker.handle(block)
-
-                # retrieve file from position where we were disconnected
-                # Possible issue with big files:
-                # https://stackoverflow.com/questions/19692739/python-ftplib-hangs-at-end-of-transfer
-                if f.tell() == 0:
-                    ftpw.ftp.retrbinary(f'RETR {from_filename}', write_progress)
-                else:
-                    ftpw.ftp.retrbinary(f'RETR {from_filename}', write_progress, rest=f.tell())
-
-                downloading = False
-                logger.info(f'Downloaded {f.tell()}/{target_size} bytes to {to_filepath}')
-            except ftplib.all_errors as e:
-                logger.exception(f'Error downloading {from_filename}', exc_info=e)
-                attempts -= 1
-
-                if attempts < 1:
-                    logger.error(
-                        f'{FTP_RETRY_COUNT} attempts made, {from_filename}.tell() is {f.tell()}')
-                    if die_on_ftperrors:
-                        ftpw.close()
-                        raise e
-                    else:
-                        exception = e
-                        break
-
-                logger.debug(f'Waiting {FTP_RETRY_DELAY} sec before download resume...')
-                time.sleep(FTP_RETRY_DELAY)
-
+        pos = 0  # bytes written to f, same as f.tell() without lseek syscall
+        allocated = 0  # bytes reserved by _preallocate, file size is at least that
+        target_size = None  # remote file size
+        tracker = None
+        hasher = hashlib.sha256() if sha256 else None  # hashes exactly `pos` bytes written
+        logger.debug('Downloading %s to %s...', from_filename, to_filepath)
+
+        try:
+            while downloading:
+                try:
+                    ftpw.reconnect()  # NOOP check, full connect only if control channel is lost
+                    if target_size is None:
+                        # remote file doesn't change between retries, SIZE is asked once
+                        ftpw.ftp.voidcmd('TYPE I')
+                        target_size = ftpw.ftp.size(from_filename)
+                    out = f
+
+                    if not compressed and not pos and target_size:
+                        # reserve extents once, retries keep writing into them
+                        allocated = _preallocate(f, target_size)
+
+                    if compressed:
+                        # decompressor state can't be restored, start from scratch
+                        pos = 0
+                        f.seek(0)
+                        f.truncate()
+                        out = zstandard.ZstdDecompressor().stream_writer(f, closefd=False)
+
+                    tracker = ProgressTracker(target_size, pos, verbose, hasher)
+
+                    # retrieve file from position where we were disconnected
+                    # Possible issue with big files:
+                    # https://stackoverflow.com/questions/19692739/python-ftplib-hangs-at-end-of-transfer
+                    retrbinary_fast(ftpw.ftp, f'RETR {from_filename}', out, tracker,
+                                    rest=(pos or None), blocksize=blocksize)
+                    out.flush()
+
+                    pos = tracker.bytes_processed
+                    downloading = False
+                    logger.info('Downloaded %d/%d bytes to %s', pos, target_size, to_filepath)
+                except ftplib.all_errors as e:
+                    if tracker:
+                        pos = tracker.bytes_processed
+                    logger.exception(f'Error downloading {from_filename}', exc_info=e)
+                    attempts -= 1
+                    # permanent reply (i.e. 550 no such file) is not retried
+                    if attempts < 1 or isinstance(e, ftplib.error_perm):
+                        logger.error('%d attempts made, %s.tell() is %d',
+                                     FTP_RETRY_COUNT - attempts, from_filename, pos)
+                        if die_on_ftperrors:
+                            raise e
+                        else:
+                            exception = e
+                            break
+
+                    delay = retry_delay(attempts)
+                    logger.debug('Waiting %.1f sec before download resume...', delay)
+                    time.sleep(delay)
+        finally:
+            if pos < allocated:
+                f.truncate(pos)  # don't leave reserved tail of incomplete download
             ftpw.close()
+            if pool:
+                pool.release(ftpw)
+
+    if not exception:
+        exception = _check_sha256(hasher, sha256, from_filename, die_on_ftperrors)
 
     if exception:
         return (False, exception)
@@ -106,7 +176,11 @@ def upload_task(from_filepath, to_filename, remote_folder='/',
                 host=None, port=0, login=None, password=None,
                 die_on_ftperrors=False,
                 verbose=0,
-                ftp=None):
+                ftp=None,
+                pool=None,
+                compressed=False,
+                sha256=None,
+                blocksize=FTP_BLOCKSIZE):
     """
     Upload with resume/reconnect support over ftplib. Remote file will be rewritten!
     Synchronous IF to be wrapped in threads.
@@ -114,68 +188,92 @@ def upload_task(from_filepath, to_filename, remote_folder='/',
 
     Params are equivalent to :py:meth:`download_task`
 
+    :param compressed: compress file on the fly and upload it as `to_filename`.zst.
+            Requires `zstandard` package, compressed upload can't be resumed - restarted
+            from the beginning on errors, progress % is not printed.
+
     :return (True, None) on successfull download, (False, exception) of last error on failed download
             Exception is raised immediately if die_on_ftperrors == True
     """
-    logger.info(f'Uploading from {from_filepath} to {remote_folder}/{to_filename}')
-    ftpw = FTPWrapper(remote_folder, host, port, login, password, verbose, ftp)
+    if compressed:
+        _require_zstandard()
+        _forbid_sha256(sha256)
+        to_filename += '.zst'
+
+    logger.info('Uploading from %s to %s/%s', from_filepath, remote_folder, to_filename)
     exception = None
     first_access = True
 
     # https://stackoverflow.com/questions/42019279/resumable-file-upload-in-python
-    with open(from_filepath, 'rb') as f:
+    with open(from_filepath, 'rb', buffering=FILE_BUFSIZE) as f:
         attempts = FTP_RETRY_COUNT
         target_size = os.path.getsize(from_filepath)
         uploading = True
         tracker = None
 
-        logger.debug(f'File of size {target_size} opened for upload...')
-
-        while uploading:
-            try:
-                ftpw.connect()
+        logger.debug('File of size %d opened for upload...', target_size)
+        # local file first, so its errors don't take a connection from the pool
+        ftpw = pool.acquire(remote_folder, host, port, login, password, verbose) if pool \
+            else FTPWrapper(remote_folder, host, port, login, password, verbose, ftp)
 
-                rest_pos = 0
-                # Get file size if exists
-                file_list = ftpw.ftp.nlst()
+        try:
+            while uploading:
+                try:
+                    ftpw.reconnect()
 
-                # file was already there - need rewrite
-                if to_filename in file_list:
-                    if first_access:
-                        logger.debug(f'{to_filename} is on server, will be rewritten')
-                    else:
+                    rest_pos = 0
+                    # first attempt always rewrites the file, retries resume from its remote size
+                    if not (first_access or compressed):
                         ftpw.ftp.voidcmd('TYPE I')
-                        rest_pos = ftpw.ftp.size(to_filename)
-                        logger.debug(
-                            f'{to_filename} exists on server, resumed from {rest_pos} byte')
-
-                f.seek(rest_pos, 0)
-                tracker = ProgressTracker(target_size, rest_pos, verbose)
-                first_access = False
-                ftpw.ftp.storbinary('STOR ' + to_filename, f, callback=tracker.handle,
-                                    rest=(rest_pos or None))
-
-                uploading = False
-                logger.info(
-                    f'Uploaded {tracker.bytes_processed}/{target_size} bytes from {from_filepath}')
-            except ftplib.all_errors as e:
-                logger.exception(f'Error uploading {from_filepath}', exc_info=e)
-                attempts -= 1
-
-                if attempts < 1:
-                    logger.error(
-                        f'{FTP_RETRY_COUNT} attempts made'
-                        + (f'{tracker.bytes_processed} bytes uploaded' if tracker else ''))
-                    if die_on_ftperrors:
-                        ftpw.close()
-                        raise e
-                    else:
-                        exception = e
-                        break
-
-                logger.debug(f'Waiting {FTP_RETRY_DELAY} sec before upload resume...')
-                time.sleep(FTP_RETRY_DELAY)
+                        try:
+                            rest_pos = ftpw.ftp.size(to_filename) or 0
+                            logger.debug('%s exists on server, resumed from %d byte',
+                                         to_filename, rest_pos)
+                        except ftplib.error_perm:  # no such file yet
+                            rest_pos = 0
+
+                    f.seek(0 if sha256 else rest_pos, 0)
+                    source = f
+                    tracker = ProgressTracker(target_size, rest_pos, verbose,
+                                              _sha256_prefix(f, rest_pos) if sha256 else None)
+
+                    if compressed:
+                        # compressed size is unknown beforehand, no progress %
+                        source = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_reader(
+                            f, size=target_size, closefd=False)
+                        tracker = ProgressTracker(target_size, rest_pos, 0)
+
+                    first_access = False
+                    storbinary_fast(ftpw.ftp, 'STOR ' + to_filename, source, tracker,
+                                    rest=(rest_pos or None), blocksize=blocksize)
+
+                    uploading = False
+                    logger.info('Uploaded %d/%d bytes from %s',
+                                tracker.bytes_processed, target_size, from_filepath)
+                except ftplib.all_errors as e:
+                    logger.exception(f'Error uploading {from_filepath}', exc_info=e)
+                    attempts -= 1
+                    # permanent reply (i.e. 553 not allowed) is not retried
+                    if attempts < 1 or isinstance(e, ftplib.error_perm):
+                        logger.error('%d attempts made, %d bytes uploaded',
+                                     FTP_RETRY_COUNT - attempts,
+                                     tracker.bytes_processed if tracker else 0)
+                        if die_on_ftperrors:
+                            raise e
+                        else:
+                            exception = e
+                            break
+
+                    delay = retry_delay(attempts)
+                    logger.debug('Waiting %.1f sec before upload resume...', delay)
+                    time.sleep(delay)
+        finally:
             ftpw.close()
+            if pool:
+                pool.release(ftpw)
+
+    if not exception:
+        exception = _check_sha256(tracker.hasher, sha256, from_filepath, die_on_ftperrors)
 
     if exception:
         return (False, exception)
@@ -183,6 +281,371 @@ def upload_task(from_filepath, to_filename, remote_folder='/',
         return (True, None)
 
 
+def batch_download(pairs, max_workers=4, **kwargs):
+    """
+    Download many files in parallel, each file over its own FTP connection.
+    Total number of connections opened by all running batches is limited
+    by `FTP_MAX_CONNECTIONS`.
+
+    :param pairs: iterable of (from_filename, to_filepath) tuples
+    :param max_workers: number of parallel downloads
+    :param kwargs: :py:func:`download_task` params except `ftp`, FTP instances can't be
+            shared across threads
+
+    :return list of :py:func:`download_task` results in `pairs` order
+            Exception is raised if die_on_ftperrors == True and any download failed
+    """
+    if kwargs.get('ftp'):
+        raise ValueError('ftp instance can not be shared across download threads')
+
+    def runner(from_filename, to_filepath):
+        with _connections:
+            return download_task(from_filename, to_filepath, **kwargs)
+
+    pairs = list(pairs)
+    results = [None] * len(pairs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(runner, *pair): i for i, pair in enumerate(pairs)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    return results
+
+
+def download_task_parallel(from_filename, to_filepath, streams=4, remote_folder='/',
+                           host=None, port=0, login=None, password=None,
+                           die_on_ftperrors=False,
+                           verbose=0):
+    """
+    Download single file over `streams` parallel connections, each one fetching its own
+    byte range (REST offset .. range end) straight into memory mapped local file.
+    Speeds up high latency links where one TCP stream can't fill the bandwidth.
+
+    Falls back to :py:func:`download_task` for small files or if server rejects REST.
+    Connections count is limited by `FTP_MAX_CONNECTIONS` shared with batch operations.
+
+    Params are equivalent to :py:func:`download_task`
+
+    :param streams: number of parallel connections
+
+    :return (True, None) on successfull download, (False, exception) of last error on failed download
+            Exception is raised immediately if die_on_ftperrors == True
+    """
+    kwargs = dict(remote_folder=remote_folder, host=host, port=port, login=login,
+                  password=password, die_on_ftperrors=die_on_ftperrors, verbose=verbose)
+    ftpw = FTPWrapper(remote_folder, host, port, login, password, verbose)
+    try:
+        ftpw.connect()
+        ftpw.ftp.voidcmd('TYPE I')
+        target_size = ftpw.ftp.size(from_filename)
+    except ftplib.all_errors as e:
+        logger.warning('Cant get %s size, fallback to single stream', from_filename, exc_info=e)
+        target_size = None
+    ftpw.close()
+
+    if streams < 2 or not target_size or target_size < streams * FTP_BLOCKSIZE:
+        return download_task(from_filename, to_filepath, **kwargs)
+
+    logger.info('Downloading from %s to %s in %d streams', from_filename, to_filepath, streams)
+    ranges = [(i * target_size // streams, (i + 1) * target_size // streams)
+              for i in range(streams)]
+    tracker = ProgressTracker(target_size, 0, verbose)
+    exception = None
+
+    with open(to_filepath, 'w+b') as f:
+        f.truncate(target_size)
+        _preallocate(f, target_size)
+
+        with mmap.mmap(f.fileno(), target_size) as mm, \
+                ThreadPoolExecutor(max_workers=streams) as executor:
+            futures = [executor.submit(_download_range, from_filename, mm, start, end, tracker,
+                                       remote_folder, host, port, login, password)
+                       for start, end in ranges]
+            for future in as_completed(futures):
+                exception = exception or future.exception()
+
+            mm.flush()
+
+    if isinstance(exception, ftplib.error_perm):
+        logger.warning('Parallel download failed: %s, fallback to single stream', exception)
+        return download_task(from_filename, to_filepath, **kwargs)
+
+    if exception:
+        if die_on_ftperrors:
+            raise exception
+        return (False, exception)
+
+    logger.info('Downloaded %d/%d bytes to %s', tracker.bytes_processed, target_size, to_filepath)
+    return (True, None)
+
+
+def _download_range(from_filename, mm, start, end, tracker,
+                    remote_folder, host, port, login, password):
+    """
+    Receive [start, end) bytes of remote file into `mm` with its own connection and retries.
+    Permanent (error_perm) errors are raised immediately.
+    """
+    lock = tracker.lock
+    attempts = FTP_RETRY_COUNT
+    pos = start
+
+    with _connections, memoryview(mm) as mv:
+        ftpw = FTPWrapper(remote_folder, host, port, login, password)
+
+        while pos < end:
+            try:
+                ftpw.connect()
+                ftpw.ftp.voidcmd('TYPE I')
+                with ftpw.ftp.transfercmd(f'RETR {from_filename}', pos) as conn:
+                    while pos < end:
+                        n = conn.recv_into(mv[pos:min(pos + FTP_BLOCKSIZE, end)])
+                        if not n:
+                            raise EOFError(f'{from_filename} ended at {pos}, expected {end}')
+                        pos += n
+                        with lock:
+                            tracker.bytes_processed += n
+                            if tracker.bytes_processed >= tracker.next_report:
+                                tracker.report()
+            except ftplib.error_perm:
+                raise
+            except ftplib.all_errors + (EOFError,) as e:
+                logger.exception(f'Error downloading {from_filename} [{start}:{end}]', exc_info=e)
+                attempts -= 1
+                if attempts < 1:
+                    raise
+                time.sleep(retry_delay(attempts))
+            finally:
+                # range is received or broken, the rest of transfer is aborted with connection
+                ftpw.close()
+
+
+def retrbinary_fast(ftp, cmd, fileobj, tracker, rest=None, blocksize=FTP_BLOCKSIZE):
+    """
+    :py:meth:`ftplib.FTP.retrbinary` replacement receiving data straight into
+    preallocated buffer, no per-block callback and bytes object allocation.
+
+    :param ftp: connected ftplib.FTP instance
+    :param cmd: RETR command
+    :param fileobj: binary file object to write received data to
+    :param tracker: :py:class:`ProgressTracker` to account received bytes
+    :param rest: optional REST offset
+    :param blocksize: receive buffer size
+
+    :return: final server response
+    """
+    mv = memoryview(bytearray(blocksize))
+    hasher = tracker.hasher
+    ftp.voidcmd('TYPE I')
+
+    with ftp.transfercmd(cmd, rest) as conn:
+        while True:
+            n = conn.recv_into(mv)
+            if not n:
+                break
+            fileobj.write(mv[:n])
+            if hasher:
+                hasher.update(mv[:n])
+            tracker.bytes_processed += n
+            if tracker.bytes_processed >= tracker.next_report:
+                tracker.report()
+
+    return ftp.voidresp()
+
+
+def storbinary_fast(ftp, cmd, fileobj, tracker, rest=None, blocksize=FTP_BLOCKSIZE):
+    """
+    :py:meth:`ftplib.FTP.storbinary` replacement reading file into preallocated buffer.
+    If no progress output or hashing needed, regular file is sent with zero-copy
+    `socket.sendfile()`.
+
+    Params are equivalent to :py:func:`retrbinary_fast`, `fileobj` must be positioned at
+    `rest` offset already.
+
+    :return: final server response
+    """
+    ftp.voidcmd('TYPE I')
+
+    with ftp.transfercmd(cmd, rest) as conn:
+        hasher = tracker.hasher
+        if tracker.verbose > 0 or hasher or not isinstance(fileobj, io.BufferedReader):
+            mv = memoryview(bytearray(blocksize))
+            while True:
+                n = fileobj.readinto(mv)
+                if not n:
+                    break
+                conn.sendall(mv[:n])
+                if hasher:
+                    hasher.update(mv[:n])
+                tracker.bytes_processed += n
+                if tracker.bytes_processed >= tracker.next_report:
+                    tracker.report()
+        else:
+            tracker.bytes_processed += conn.sendfile(fileobj, fileobj.tell())
+            tracker.report()
+
+    return ftp.voidresp()
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff with jitter, grows from FTP_RETRY_DELAY up to FTP_RETRY_MAX_DELAY
+
+    :param attempts: attempts left after the failed one
+    :return: seconds to wait before the next attempt
+    """
+    failed = FTP_RETRY_COUNT - attempts  # 1 after the first failure
+    delay = min(FTP_RETRY_MAX_DELAY, FTP_RETRY_DELAY * FTP_RETRY_BASE ** (failed - 1))
+    return delay + random.uniform(0, 0.5)
+
+
+def _preallocate(f, size):
+    """
+    Reserve `size` bytes of disk space for `f` with a single syscall if OS supports it,
+    so received blocks are written into contiguous extents.
+
+    :return: bytes reserved, 0 if not supported by OS or filesystem
+    """
+    if not hasattr(os, 'posix_fallocate'):
+        return 0
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+        return size
+    except OSError as e:
+        logger.debug('posix_fallocate is not supported: %s', e)
+        return 0
+
+
+def _sha256_prefix(f, size):
+    """
+    :return: sha256 hasher fed with first `size` bytes of `f`, leaves `f` positioned at `size`
+    """
+    hasher = hashlib.sha256()
+    while size > 0:
+        block = f.read(min(size, FILE_BUFSIZE))
+        hasher.update(block)
+        size -= len(block)
+    return hasher
+
+
+def _check_sha256(hasher, sha256, filename, die_on_ftperrors):
+    """
+    :return: ValueError on digest mismatch (raised if die_on_ftperrors), None otherwise
+    """
+    if not sha256 or hasher.hexdigest() == sha256.lower():
+        return None
+
+    e = ValueError(f'{filename} sha256 {hasher.hexdigest()} does not match expected {sha256}')
+    logger.error(str(e))
+    if die_on_ftperrors:
+        raise e
+    return e
+
+
+def _forbid_sha256(sha256):
+    if sha256:
+        raise ValueError('sha256 check is not supported for compressed transfers')
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ImportError('zstandard package is required for compressed transfers')
+
+
+def tune_socket(sock):
+    """
+    Disable Nagle algorithm and enlarge kernel buffers of FTP control/data socket
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, FTP_SOCKET_BUFSIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, FTP_SOCKET_BUFSIZE)
+
+
+class TunedFTP(ftplib.FTP):
+    """
+    ftplib.FTP with :py:func:`tune_socket` applied to every data connection
+    """
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        tune_socket(conn)
+        return conn, size
+
+
+class FTPConnectionPool:
+    """
+    Thread safe pool of logged in :py:class:`FTPWrapper` connections keyed by (host, port, login).
+    Saves connect/login/cwd round-trips when many files are transferred one after another.
+
+    Connection taken from the pool must be used by a single thread only until released.
+    """
+
+    def __init__(self):
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, remote_folder='/', host=None, port=0, login=None, password=None, verbose=0):
+        """
+        Take idle connection from the pool or create new one (connected lazily by
+        :py:meth:`FTPWrapper.reconnect`).
+
+        :return: :py:class:`FTPWrapper` owned by the pool
+        """
+        try:
+            ftpw = self._queue(host, port, login).get_nowait()
+        except queue.Empty:
+            ftpw = FTPWrapper(remote_folder, host, port, login, password, verbose)
+            ftpw.pool = self
+            return ftpw
+
+        if ftpw.remote_folder != remote_folder:
+            ftpw.remote_folder = remote_folder
+            try:
+                ftpw.ftp.cwd(remote_folder)
+            except ftplib.all_errors:
+                ftpw.ftp.close()  # full reconnect on next FTPWrapper.connect()
+
+        return ftpw
+
+    def release(self, ftpw):
+        """
+        Return connection to the pool if it's still alive, close it otherwise
+        """
+        if ftpw.alive():
+            self._queue(ftpw.host, ftpw.port, ftpw.login).put(ftpw)
+        else:
+            ftpw.ftp.close()
+
+    @contextmanager
+    def connection(self, remote_folder='/', host=None, port=0, login=None, password=None,
+                   verbose=0):
+        """
+        Context manager for :py:meth:`acquire`/:py:meth:`release` pair.
+        Yielded connection must be connected with :py:meth:`FTPWrapper.reconnect`.
+        """
+        ftpw = self.acquire(remote_folder, host, port, login, password, verbose)
+        try:
+            yield ftpw
+        finally:
+            self.release(ftpw)
+
+    def close(self):
+        """
+        Close all idle connections
+        """
+        with self._lock:
+            queues = list(self._queues.values())
+            self._queues.clear()
+
+        for q in queues:
+            while not q.empty():
+                q.get_nowait().ftp.close()
+
+    def _queue(self, host, port, login):
+        with self._lock:
+            return self._queues.setdefault((host, port, login), queue.Queue())
+
+
 class FTPWrapper:
     """
     ftplib.FTP wrapper for reconnect/close operations
@@ -197,6 +660,7 @@ class FTPWrapper:
         self.login = login
         self.password = password
         self.verbose = verbose
+        self.pool = None  # owner FTPConnectionPool, pooled connections are kept open on close()
 
         if ftp:
             self.remote_folder = ftp.pwd()
@@ -204,8 +668,8 @@ class FTPWrapper:
             self.port = ftp.port
             self.dispose_ftp = False
         else:
-            ftp = ftplib.FTP(timeout=FTP_OPERATION_TIMEOUT)
-            ftp.set_debuglevel(verbose)
+            ftp = TunedFTP(timeout=FTP_OPERATION_TIMEOUT)
+            ftp.set_debuglevel(FTP_DEBUGLEVEL)
             self.dispose_ftp = True
 
         self.ftp = ftp
@@ -214,9 +678,14 @@ class FTPWrapper:
         # https://github.com/keepitsimple/pyFTPclient/blob/master/pyftpclient.py
 
     def connect(self):
-        logger.debug(
-            f'Connect to FTP: {self.host}:{self.port} {self.login}@***, dir={self.remote_folder}')
+        if self.ftp.sock:
+            self.ftp.close()  # drop previous broken connection
+
+        logger.debug('Connect to FTP: %s:%s %s@***, dir=%s',
+                     self.host, self.port, self.login, self.remote_folder)
         self.ftp.connect(self.host, self.port)
+        # no Nagle delays on short control commands (TYPE, SIZE, REST, RETR...)
+        tune_socket(self.ftp.sock)
         self.ftp.login(self.login, self.password)
         self.ftp.cwd(self.remote_folder)
         # optimize socket params for download task
@@ -229,27 +698,78 @@ class FTPWrapper:
             self.ftp.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 40)
             self.ftp.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 50)
 
+    def reconnect(self):
+        """
+        Keep control connection if it's still alive (i.e. only data channel failed),
+        full connect/login/cwd otherwise
+        """
+        if not self.alive():
+            self.connect()
+
+    def alive(self):
+        """
+        :return: True if control connection is open and responds to NOOP
+        """
+        if not self.ftp.sock:
+            return False
+        try:
+            # any other reply means stale response of aborted transfer, can't trust this session
+            return self.ftp.sendcmd('NOOP').startswith('200')
+        except ftplib.all_errors:
+            return False
+
     def close(self):
+        if self.pool:
+            return
+
         if self.dispose_ftp:
             self.ftp.close()
-            logger.debug(f'FTP closed.')
+            logger.debug('FTP closed.')
 
 
 class ProgressTracker:
-    def __init__(self, total_size, offset=0, verbose=0):
+    """
+    Transferred bytes counter, prints progress once per 1% (but not more often than
+    every `FTP_PROGRESS_STEP` bytes and `FTP_PROGRESS_INTERVAL` seconds) if verbose > 0.
+    Optionally hashes transferred data.
+    """
+
+    def __init__(self, total_size, offset=0, verbose=0, hasher=None):
         self.verbose = verbose
+        self.hasher = hasher  # optional hashlib object updated with every processed block
         self.total_size = total_size
         self.bytes_processed = offset
-        self.percent_complete = round(self.bytes_processed / self.total_size * 100)
+        self.step = max(total_size // 100, FTP_PROGRESS_STEP)
+        self.next_report = min(offset + self.step, total_size)
+        self.lock = threading.Lock()  # for trackers shared by parallel streams
+        self._last_print_t = 0.
+
+    @property
+    def percent_complete(self):
+        return self.bytes_processed * 100 // self.total_size if self.total_size else 100
 
     def handle(self, block):
+        if self.hasher:
+            self.hasher.update(block)
         self.bytes_processed += len(block)
-        self.percent_complete = round(self.bytes_processed / self.total_size * 100)
+        if self.bytes_processed >= self.next_report:
+            self.report()
+
+    def report(self):
+        # last report always happens exactly on transfer completion, and only once
+        self.next_report = self.bytes_processed + self.step
+        if not self.complete():
+            self.next_report = min(self.next_report, self.total_size)
 
         if self.verbose > 0:
-            print(f'\r{self.percent_complete}%', flush=True, end='\r')
             if self.complete():
-                print(f'100% complete ({self.bytes_processed} bytes processed)')
+                print(f'\r100% complete ({self.bytes_processed} bytes processed)')
+            else:
+                now = time.monotonic()
+                if now - self._last_print_t >= FTP_PROGRESS_INTERVAL:
+                    self._last_print_t = now
+                    sys.stdout.write(f'\r{self.percent_complete}%')
+                    sys.stdout.flush()
 
     def complete(self):
         return self.bytes_processed >= self.total_size
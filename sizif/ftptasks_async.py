@@ -0,0 +1,228 @@
+import asyncio
+import logging
+
+import aioftp
+
+from sizif.ftptasks import FTP_RETRY_COUNT, FTP_OPERATION_TIMEOUT, \
+    FTP_BLOCKSIZE, FILE_BUFSIZE, retry_delay
+
+"""
+asyncio counterparts of sizif.ftptasks jobs, many small files are transferred
+concurrently on a single event loop instead of thread per file.
+
+Requires optional `aioftp` package.
+"""
+
+AIOFTP_ERRORS = (aioftp.StatusCodeError, OSError, asyncio.TimeoutError)
+
+logger = logging.getLogger(__name__)
+
+
+async def download_task_async(from_filename, to_filepath, remote_folder='/',
+                              host=None, port=0, login=None, password=None,
+                              die_on_ftperrors=False,
+                              blocksize=FTP_BLOCKSIZE):
+    """
+    Download with resume/reconnect support over aioftp.
+    Local file will be rewritten.
+
+    Params are equivalent to :py:func:`sizif.ftptasks.download_task`
+
+    :return (True, None) on successfull download, (False, exception) of last error on failed download
+            Exception is raised immediately if die_on_ftperrors == True
+    """
+    logger.info('Downloading from %s to %s', from_filename, to_filepath)
+    exception = None
+
+    with open(to_filepath, 'w+b', buffering=FILE_BUFSIZE) as f:
+        attempts = FTP_RETRY_COUNT
+
+        while True:
+            try:
+                async with aioftp.Client.context(host, port or aioftp.DEFAULT_PORT,
+                                                 login or aioftp.DEFAULT_USER,
+                                                 password or aioftp.DEFAULT_PASSWORD,
+                                                 socket_timeout=FTP_OPERATION_TIMEOUT) as client:
+                    await client.change_directory(remote_folder)
+                    # retrieve file from position where we were disconnected
+                    async with client.download_stream(from_filename, offset=f.tell()) as stream:
+                        async for block in stream.iter_by_block(blocksize):
+                            f.write(block)
+
+                logger.info('Downloaded %d bytes to %s', f.tell(), to_filepath)
+                break
+            except AIOFTP_ERRORS as e:
+                logger.exception(f'Error downloading {from_filename}', exc_info=e)
+                attempts -= 1
+
+                if attempts < 1 or _permanent(e):
+                    logger.error('%d attempts made, %s.tell() is %d',
+                                 FTP_RETRY_COUNT - attempts, from_filename, f.tell())
+                    if die_on_ftperrors:
+                        raise e
+                    else:
+                        exception = e
+                        break
+
+                delay = retry_delay(attempts)
+                logger.debug('Waiting %.1f sec before download resume...', delay)
+                await asyncio.sleep(delay)
+
+    if exception:
+        return (False, exception)
+    else:
+        return (True, None)
+
+
+async def upload_task_async(from_filepath, to_filename, remote_folder='/',
+                            host=None, port=0, login=None, password=None,
+                            die_on_ftperrors=False,
+                            client=None,
+                            blocksize=FTP_BLOCKSIZE):
+    """
+    Upload with resume/reconnect support over aioftp.
+    Remote file will be rewritten.
+
+    Params are equivalent to :py:func:`sizif.ftptasks.upload_task`
+
+    :param client: connected aioftp.Client with `remote_folder` as current directory to upload
+            over, checked with NOOP first, reconnected with given credentials on errors and
+            left open. If None - new created and closed after upload complete
+
+    :return (True, None) on successfull upload, (False, exception) of last error on failed upload
+            Exception is raised immediately if die_on_ftperrors == True
+    """
+    logger.info('Uploading from %s to %s/%s', from_filepath, remote_folder, to_filename)
+    own_client = client is None
+    if own_client:
+        client = aioftp.Client(socket_timeout=FTP_OPERATION_TIMEOUT)
+    connected = not own_client and await _alive(client)
+    if not (own_client or connected):
+        client.close()  # kept alive session was dropped by server while idle
+    exception = None
+
+    with open(from_filepath, 'rb', buffering=FILE_BUFSIZE) as f:
+        attempts = FTP_RETRY_COUNT
+        offset = 0
+        stored = False  # data of this upload was sent, remote file has its head
+
+        while True:
+            try:
+                if not connected:
+                    await connect_async(remote_folder, host, port, login, password, client)
+                    connected = True
+
+                # upload rest of the file from what's already on server, remote file of
+                # previous upload is rewritten from scratch
+                offset = await _remote_size(client, to_filename) if stored else 0
+
+                f.seek(offset)
+                async with client.upload_stream(to_filename, offset=offset) as stream:
+                    while True:
+                        block = f.read(blocksize)
+                        if not block:
+                            break
+                        await stream.write(block)
+                        stored = True
+
+                logger.info('Uploaded %d bytes from %s', f.tell(), from_filepath)
+                break
+            except AIOFTP_ERRORS as e:
+                logger.exception(f'Error uploading {from_filepath}', exc_info=e)
+                client.close()
+                connected = False
+                attempts -= 1
+
+                if attempts < 1 or _permanent(e):
+                    logger.error('%d attempts made, %d bytes uploaded',
+                                 FTP_RETRY_COUNT - attempts, f.tell())
+                    if die_on_ftperrors:
+                        raise e
+                    else:
+                        exception = e
+                        break
+
+                delay = retry_delay(attempts)
+                logger.debug('Waiting %.1f sec before upload resume...', delay)
+                await asyncio.sleep(delay)
+
+    if own_client:
+        client.close()
+
+    if exception:
+        return (False, exception)
+    else:
+        return (True, None)
+
+
+async def connect_async(remote_folder='/', host=None, port=0, login=None, password=None,
+                        client=None):
+    """
+    Connect, login and change directory to `remote_folder`
+
+    :param client: closed aioftp.Client to reconnect, if None - new one is created
+    :return: connected aioftp.Client
+    """
+    client = client or aioftp.Client(socket_timeout=FTP_OPERATION_TIMEOUT)
+    await client.connect(host, port or aioftp.DEFAULT_PORT)
+    await client.login(login or aioftp.DEFAULT_USER, password or aioftp.DEFAULT_PASSWORD)
+    await client.change_directory(remote_folder)
+    return client
+
+
+async def reconnect_async(client, remote_folder='/', host=None, port=0, login=None,
+                          password=None):
+    """
+    Keep `client` session if it responds to NOOP, close and connect it again otherwise
+    """
+    if not await _alive(client):
+        client.close()
+        await connect_async(remote_folder, host, port, login, password, client)
+
+
+async def _alive(client):
+    """
+    :return: True if client session responds to NOOP
+    """
+    try:
+        await client.command('NOOP', '2xx')
+        return True
+    except AIOFTP_ERRORS:
+        return False
+
+
+def _permanent(e):
+    """
+    :return: True if `e` is permanent (5xx) FTP reply (i.e. 550 no such file), not worth retrying
+    """
+    return isinstance(e, aioftp.StatusCodeError) and \
+        any(code.matches('5xx') for code in e.received_codes)
+
+
+async def _remote_size(client, filename):
+    """
+    :return: remote file size, 0 if it doesn't exist or server can't tell
+    """
+    try:
+        return int((await client.stat(filename)).get('size', 0))
+    except aioftp.StatusCodeError:
+        return 0
+
+
+async def batch_download_async(pairs, concurrency=8, **kwargs):
+    """
+    Download many files concurrently, at most `concurrency` control connections at once.
+
+    :param pairs: iterable of (from_filename, to_filepath) tuples
+    :param concurrency: max number of simultaneous FTP connections
+    :param kwargs: :py:func:`download_task_async` params
+
+    :return list of :py:func:`download_task_async` results in `pairs` order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def runner(from_filename, to_filepath):
+        async with semaphore:
+            return await download_task_async(from_filename, to_filepath, **kwargs)
+
+    return await asyncio.gather(*(runner(*pair) for pair in pairs))
@@ -0,0 +1,129 @@
+import logging
+import socket
+import time
+from urllib.parse import quote
+
+from sizif import ftptasks
+from sizif.ftptasks import FTP_RETRY_COUNT, FTP_OPERATION_TIMEOUT, \
+    FTP_BLOCKSIZE, FILE_BUFSIZE, FTP_DEBUGLEVEL, ProgressTracker, retry_delay
+
+try:
+    import pycurl
+except ImportError:
+    pycurl = None
+
+"""
+libcurl powered counterparts of sizif.ftptasks jobs, transfer loop runs in C code.
+
+Requires optional `pycurl` package, falls back to sizif.ftptasks if it's not installed.
+"""
+
+CURL_BUFFERSIZE = 512 * 1024  # max libcurl receive buffer
+# permanent errors, i.e. 550 no such file or 530 login denied, not worth retrying
+CURL_PERMANENT_ERRORS = {pycurl.E_REMOTE_FILE_NOT_FOUND, pycurl.E_LOGIN_DENIED,
+                         pycurl.E_REMOTE_ACCESS_DENIED} if pycurl else set()
+
+logger = logging.getLogger(__name__)
+
+
+def download_task(from_filename, to_filepath, remote_folder='/',
+                  host=None, port=0, login=None, password=None,
+                  die_on_ftperrors=False,
+                  verbose=0,
+                  ftp=None,
+                  pool=None,
+                  blocksize=FTP_BLOCKSIZE):
+    """
+    Download with resume/reconnect support over libcurl.
+
+    Params and result are equivalent to :py:func:`sizif.ftptasks.download_task`.
+    Existing ftplib connection can't be used by libcurl, so if `ftp` or `pool` is given
+    or pycurl is not installed, download is done by :py:func:`sizif.ftptasks.download_task`.
+    """
+    if pycurl is None or ftp or pool:
+        return ftptasks.download_task(from_filename, to_filepath, remote_folder=remote_folder,
+                                      host=host, port=port, login=login, password=password,
+                                      die_on_ftperrors=die_on_ftperrors, verbose=verbose,
+                                      ftp=ftp, pool=pool, blocksize=blocksize)
+
+    logger.info('Downloading from %s to %s', from_filename, to_filepath)
+    path = '/'.join(quote(p) for p in remote_folder.split('/') + [from_filename] if p)
+    if remote_folder.startswith('/'):
+        path = '%2F' + path  # absolute like ftplib cwd(), URL path is relative to login dir
+    exception = None
+
+    c = pycurl.Curl()
+    c.setopt(pycurl.URL, f'ftp://{host}:{port or 21}/{path}')
+    c.setopt(pycurl.USERPWD, f'{login or "anonymous"}:{password or ""}')
+    c.setopt(pycurl.BUFFERSIZE, max(CURL_BUFFERSIZE, blocksize))
+    c.setopt(pycurl.NOSIGNAL, 1)
+    c.setopt(pycurl.CONNECTTIMEOUT, int(FTP_OPERATION_TIMEOUT))
+    # stalled transfer detection, similar to ftplib socket timeout
+    c.setopt(pycurl.LOW_SPEED_LIMIT, 1)
+    c.setopt(pycurl.LOW_SPEED_TIME, int(FTP_OPERATION_TIMEOUT))
+    c.setopt(pycurl.SOCKOPTFUNCTION, _tune_curl_socket)
+    c.setopt(pycurl.VERBOSE, int(FTP_DEBUGLEVEL > 0))
+
+    with open(to_filepath, 'w+b', buffering=FILE_BUFSIZE) as f:
+        attempts = FTP_RETRY_COUNT
+        pos = 0  # bytes written to f
+        tracker = None
+        c.setopt(pycurl.WRITEDATA, f)
+
+        if verbose > 0:
+            def xferinfo(dltotal, dlnow, ultotal, ulnow):
+                nonlocal tracker
+                # total size is known only after transfer started
+                if dltotal and not tracker:
+                    tracker = ProgressTracker(pos + dltotal, pos, verbose)
+                if tracker and pos + dlnow >= tracker.next_report:
+                    tracker.bytes_processed = pos + dlnow
+                    tracker.report()
+
+            c.setopt(pycurl.NOPROGRESS, 0)
+            c.setopt(pycurl.XFERINFOFUNCTION, xferinfo)
+
+        while True:
+            try:
+                # retrieve file from position where we were disconnected
+                c.setopt(pycurl.RESUME_FROM_LARGE, pos)
+                tracker = None
+                c.perform()
+                pos += int(c.getinfo(pycurl.SIZE_DOWNLOAD))
+                logger.info('Downloaded %d bytes to %s', pos, to_filepath)
+                break
+            except pycurl.error as e:
+                pos += int(c.getinfo(pycurl.SIZE_DOWNLOAD))
+                logger.exception(f'Error downloading {from_filename}', exc_info=e)
+                attempts -= 1
+
+                if attempts < 1 or e.args[0] in CURL_PERMANENT_ERRORS:
+                    logger.error('%d attempts made, %s.tell() is %d',
+                                 FTP_RETRY_COUNT - attempts, from_filename, pos)
+                    if die_on_ftperrors:
+                        c.close()
+                        raise e
+                    else:
+                        exception = e
+                        break
+
+                delay = retry_delay(attempts)
+                logger.debug('Waiting %.1f sec before download resume...', delay)
+                time.sleep(delay)
+
+    c.close()
+
+    if exception:
+        return (False, exception)
+    else:
+        return (True, None)
+
+
+def _tune_curl_socket(curlfd, purpose):
+    """
+    libcurl SOCKOPTFUNCTION, applies :py:func:`sizif.ftptasks.tune_socket` options
+    """
+    # fromfd duplicates descriptor, options are set on the same underlying socket
+    with socket.fromfd(curlfd, socket.AF_INET, socket.SOCK_STREAM) as sock:
+        ftptasks.tune_socket(sock)
+    return pycurl.SOCKOPT_OK
@@ -76,14 +76,29 @@ class KerasModelWrapper:
         """
         Explicitly load recent model state from `storage.current_checkpoint` if present
         """
-        if self.storage.current_checkpoint:
+        self.storage.wait_ready()
+        checkpoint = self.storage.current_checkpoint
+
+        if checkpoint:
             if self.storage.save_weights_only:
-                self.model.load_weights(self.storage.current_checkpoint)
+                self.model.load_weights(checkpoint)
             else:
-                self.model = load_model(self.storage.current_checkpoint)
-            print(f'\nModel weights loaded from: {self.storage.current_checkpoint}')
+                self.model = load_model(checkpoint)
+            print(f'\nModel weights loaded from: {checkpoint}')
         else:
-            print(f'\nModel weights not loaded. cp: "{self.storage.current_checkpoint}"')
+            print(f'\nModel weights not loaded. cp: "{checkpoint}"')
+
+    def predict(self, *args, **kwargs):
+        """
+        Explicit proxy to keras model `predict`, skips :py:meth:`__getattr__` fallback
+        """
+        return self.model.predict(*args, **kwargs)
+
+    def evaluate(self, *args, **kwargs):
+        """
+        Explicit proxy to keras model `evaluate`, skips :py:meth:`__getattr__` fallback
+        """
+        return self.model.evaluate(*args, **kwargs)
 
     def __getattr__(self, name):
         """
@@ -152,16 +167,17 @@ class KerasModelWrapper:
                 filepath = self.filepath.format(epoch=epoch + 1, **logs)
 
                 if self.save_best_only:
-                    current = logs.get(self.monitor)
+                    monitor, best = self.monitor, self.best
+                    current = logs.get(monitor)
                     if current is None:
                         print(
-                            f'\nCan save best model only with {self.monitor} available, skipping.')
+                            f'\nCan save best model only with {monitor} available, skipping.')
                     else:
-                        if self.monitor_op(current, self.best):
+                        if self.monitor_op(current, best):
                             if self.verbose > 0:
                                 print('\nEpoch %05d: %s improved from %0.5f to %0.5f,'
                                       ' saving model to %s'
-                                      % (epoch + 1, self.monitor, self.best,
+                                      % (epoch + 1, monitor, best,
                                          current, filepath))
                             self.best = current
                             if self.save_weights_only:
@@ -172,7 +188,7 @@ class KerasModelWrapper:
                         else:
                             if self.verbose > 0:
                                 print('\nEpoch %05d: %s did not improve from %0.5f' %
-                                      (epoch + 1, self.monitor, self.best))
+                                      (epoch + 1, monitor, best))
                 else:
                     if self.verbose > 0:
                         print('\nEpoch %05d: saving model to %s' % (epoch + 1, filepath))
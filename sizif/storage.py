@@ -1,32 +1,129 @@
+import asyncio
+import atexit
 import ftplib
 import json
 import os
 import re
-import sys
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import string
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from sizif import ftptasks
 from sizif.ftptasks import download_task, upload_task
 
-logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from sizif import ftptasks_async
+except ImportError:
+    ftptasks_async = None  # aioftp is not installed
+
 logger = logging.getLogger(__name__)
 
+FTP_UPLOAD_QUEUE_SIZE = 2  # pending checkpoint uploads before on_checkpoint_written blocks
+FTP_CHECKPOINT_BLOCKSIZE = 1024 * 1024  # checkpoint transfer block, they're tens of MB and more
+
+_RE_VERSION = re.compile(r'[^\w.]')  # chars not allowed in model version
+_RE_FILESEP = re.compile(r'[/\\;\s]+')  # checkpoint template flattening, keeps format spec ':'
+_RE_PATHSEP = re.compile(r'[/\\:;\s]+')  # remote folder flattening
+
+_prepared_dirs = set()  # local folders already created by this process
+_fdatasync = getattr(os, 'fdatasync', os.fsync)  # no mtime flush where supported
+_open_monitors = weakref.WeakSet()  # FTP monitors to close on exit, dropped ones are collected
+
+
+@atexit.register
+def _close_monitors():
+    """
+    Finish uploads and close pooled connections of monitors not closed explicitly
+    """
+    for monitor in list(_open_monitors):
+        monitor.close()
+
+
+def _dumps(obj):
+    """
+    :return: JSON encoded `obj` bytes, native orjson encoder if installed
+    """
+    if orjson:
+        # keras logs values are numpy scalars
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, separators=(',', ':')) + '\n').encode()
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _prepare_dir(folder, force=False):
+    """
+    os.makedirs(folder) once per process, unless `force`
+    """
+    if force or folder not in _prepared_dirs:
+        os.makedirs(folder, exist_ok=True)
+        _prepared_dirs.add(folder)
+
+
+def _drop_pagecache(path):
+    """
+    Hint OS to evict `path` pages from page cache, so big checkpoint files don't displace
+    training data. Best effort, dirty pages are kept until written back by OS.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.debug('Cant drop %s from page cache: %s', path, e)
+
+
+def _readable(path):
+    """
+    :return: True if `path` exists and is readable, single access() syscall
+    """
+    return bool(path) and os.access(path, os.R_OK)
+
+
+def _template_regex(file_template):
+    """
+    :return: compiled regex fully matching file names produced by `file_template`.
+            Field values may not contain _ (i.e. numbers), so names of other version
+            `model_{version}_...` with the same prefix never match
+    """
+    parts = list()
+    for literal, field, _, _ in string.Formatter().parse(file_template):
+        parts.append(re.escape(literal))
+        if field is not None:
+            parts.append(r'[^_]+?')
+    return re.compile(''.join(parts))
+
 
 class FileCheckpointsMonitor:
     """
     Local filesystem interface for counting and rotating saved model snapshots.
 
-    NOTE: Snapshots rotation is in the scope of current class instance lifecycle.
-          New object will not rotate files from previous run.
-          Unless snapshots file names are the same
+    NOTE: Recent checkpoints list is persisted in the status file, so new object keeps
+          rotating files from previous run with the same `version` and `folder`.
+          Checkpoint files missing from the status file (i.e. it was lost) are picked up
+          from `folder` on start and rotated as well, see `stale_ttl`.
 
     Public read-only properties:
         current_checkpoint - local path to recently written checkpoint file
         current_params - dict with additional params of currently written checkpoint
-        checkpoints - list of all checkpoint file names available to current instance
+        checkpoints - tuple of recent checkpoint file names available to current instance
         rotate_number - number of recent checkpoints to keep, -1 meaning never rotate
-        state_file - local path to status file
+        state_filepath - local path to status file
 
         checkpoint_path - checkpoints file path template to use in code actually saving checkpoints
 
@@ -39,7 +136,9 @@ class FileCheckpointsMonitor:
                  save_best_only=False,
                  save_weights_only=False,
                  mode='auto',
-                 period=1
+                 period=1,
+                 fsync=True,
+                 stale_ttl=None
                  ):
         """
         Setup files, folders and instance variables.
@@ -57,7 +156,8 @@ class FileCheckpointsMonitor:
 
         :param rotate_number: number of recent checkpoints to keep, -1 or 0 meaning keep all.
         
-        :param verbose: 0 - silent, 1 - print out key operations to STDOUT.
+        :param verbose: 0 - silent, 1 - log key operations to `sizif.storage` logger at DEBUG
+                level, shown only if application configures logging (i.e. logging.basicConfig).
 
         :param monitor: quantity to monitor.
 
@@ -80,62 +180,89 @@ class FileCheckpointsMonitor:
 
         :param period: Interval (number of epochs) between checkpoints.
 
+        :param fsync: sync status file to disk on every save. False is faster, but status file
+                may be lost on OS crash or power failure (never truncated though).
+
+        :param stale_ttl: seconds, untracked checkpoint files older than that found in `folder`
+                on start are removed. Younger ones are added to checkpoints by modification time
+                and rotated as usual. None - never remove on start.
+
         """
         self.save_best_only = save_best_only
         self.save_weights_only = save_weights_only
         self.mode = mode
         self.monitor = monitor
         self.period = period
+        self.fsync = fsync
+        self.stale_ttl = stale_ttl
 
         self.verbose = int(verbose)
         self.rotate_number = int(rotate_number) or -1
 
-        model_version = re.sub(r'[^\w.]', '', str(version))
+        model_version = _RE_VERSION.sub('', str(version))
         self.state_filename = f'currentstate_{model_version}.json'
         self.state_filepath = os.path.normpath(os.path.join(folder, self.state_filename))
 
-        file_name = 'model_' + model_version + '_' + re.sub(r'[/\\;\s]+', '_', str(file_template))
+        file_name = 'model_' + model_version + '_' + _RE_FILESEP.sub('_', str(file_template))
         # '.weights.{epoch:04d}-{' + monitor + ':.3f}.hdf5'
 
         self.checkpoint_path = os.path.normpath(os.path.join(folder, file_name))
-        self.checkpoints = list()
+        # full deque evicts the oldest checkpoint on append, it's kept in _evicted till rotation
+        self._checkpoints = deque(maxlen=self.rotate_number if self.rotate_number > 0 else None)
+        self._checkpoints_view = None  # cached tuple(self._checkpoints), reset on change
+        self._evicted = list()
+        self._rotate_pool = None  # created on first rotation of many files
         self.current_checkpoint = ''
         self.current_params = dict()
+        self._state_blob = None  # encoded state last written to or read from state file
         self._load_statefile()
 
     def _load_statefile(self):
         # https://stackoverflow.com/a/12517490/1245302
         # check folder access and initialize current status file value
         if not os.path.isfile(self.state_filepath):
-            os.makedirs(os.path.dirname(self.state_filepath), exist_ok=True)
+            _prepare_dir(os.path.dirname(self.state_filepath))
             self.reset()
         else:
             self._load_current_status()
+        self._discover_existing(self.stale_ttl)
 
     # ---------------- PUBLIC interface --------------------------------------------
 
+    @property
+    def checkpoints(self):
+        """
+        Read-only tuple of recent checkpoint paths, oldest first
+        """
+        if self._checkpoints_view is None:
+            self._checkpoints_view = tuple(self._checkpoints)
+        return self._checkpoints_view
+
     def on_checkpoint_written(self, file_path, params):
         """
         Must be called after actual file is written to local FS. Makes storage aware and
         able to run additional processing.
 
         :param file_path:
-        :param params: additional params dict to save to `state_file` like epoch number,
+        :param params: additional params dict to save to `state_filepath` like epoch number,
                 val_loss etc.
+        :return: True if status file was updated, False if status hasn't changed
         :raise: FileNotFoundError if file_path doesn't exist or not accessible
         """
-        logger.info(f'#on_checkpoint_written({file_path}, ...)')
+        logger.info('#on_checkpoint_written(%s, ...)', file_path)
         params = params or {}
         # if checkpoint is not present
-        if not (os.path.isfile(file_path) and os.access(file_path, os.R_OK)):
+        if not _readable(file_path):
             raise FileNotFoundError(f'"{file_path}" file is not available!')
 
         # update current_checkpoint, current_params
         self._add_checkpoint(file_path, params)
-        self._save_current_status()
-
         self.rotate_checkpoints()
+        # single status write with both new checkpoint and rotated list
+        saved = self._save_current_status()
+        self._release_checkpoint(file_path)
         self._verbose('Checkpoint processed successfully')
+        return saved
 
     def rotate_checkpoints(self, rotate_number=None, rotate_fn=None):
         """
@@ -149,68 +276,198 @@ class FileCheckpointsMonitor:
 
         :return: True if any actual checkpoints were removed, False otherwise
         """
-        logger.info(f'Rotating {self.rotate_number} cpoints from {self.checkpoints}')
+        logger.info('Rotating %s cpoints from %s', self.rotate_number, self.checkpoints)
         rotate_number = int(rotate_number or self.rotate_number)  # that's right, no 0 rotation!
         if rotate_number < 1: return False
 
-        old_size = len(self.checkpoints)
-        to_remove = self.checkpoints[:-rotate_number]
-        self.checkpoints = self.checkpoints[-rotate_number:]
-        new_size = len(self.checkpoints)
-
-        for i in to_remove:
-            try:
-                os.remove(i)
-                if rotate_fn:
-                    rotate_fn(i)
-            except OSError as e:
-                logger.warning(f'cant remove file: {e}', exc_info=e)
+        to_remove, self._evicted = self._evicted, list()
+        while len(self._checkpoints) > rotate_number:
+            to_remove.append(self._checkpoints.popleft())
+        self._checkpoints_view = None
+        new_size = len(self._checkpoints)
+
+        if len(to_remove) > 1:
+            # i.e. first rotation of restored checkpoints, unlink big files concurrently
+            futures = [self._rotate_executor().submit(self._remove_checkpoint, i, rotate_fn)
+                       for i in to_remove]
+            wait(futures)
+            for future in futures:
+                future.result()  # reraise rotate_fn errors
+        else:
+            for i in to_remove:
+                self._remove_checkpoint(i, rotate_fn)
 
-        self._verbose(f'Rotated. Checkpoints size: {new_size}')
+        self._verbose('Rotated. Checkpoints size: %d', new_size)
 
-        return bool(new_size - old_size)
+        return bool(to_remove)
 
     def reset(self):
         """
         Clears all checkpoints and saves blank checkpoint status file. No checkpoints are rotated.
         """
-        logger.info(f'#reset(), checkpoints: {len(self.checkpoints)}')
+        logger.info('#reset(), checkpoints: %d', len(self._checkpoints))
         self.current_checkpoint = ''
-        self.checkpoints.clear()
+        self.current_params = {'checkpoint': ''}
+        self._checkpoints.clear()
+        self._checkpoints_view = None
+        self._evicted.clear()
         self._save_current_status()
 
+    def wait_ready(self):
+        """
+        Block until storage state is loaded. Local state is loaded in constructor, so no-op here.
+        """
+        pass
+
     # --------------- protected methods --------------------------------------------
 
     def _load_current_status(self, reset_on_deadcheckpoint=True):
         try:
-            with open(self.state_filepath, "r") as fp:
-                data = json.load(fp)
-
-            self._add_checkpoint(data['checkpoint'], data)
-
-            # if checkpoint is not present - reset the checkpoint
-            if reset_on_deadcheckpoint \
-                    and not (os.path.isfile(self.current_checkpoint)
-                             and os.access(self.current_checkpoint, os.R_OK)):
-                self.reset()
+            self._apply_status(self._read_status(), reset_on_deadcheckpoint)
         except Exception as e:
-            logger.exception(f'Error reading {self.state_filepath}', exc_info=e)
+            logger.exception('Error reading %s', self.state_filepath, exc_info=e)
+            self.reset()
+
+    def _read_status(self):
+        """
+        :return: parsed status file dict
+        """
+        with open(self.state_filepath, "rb") as fp:
+            self._state_blob = fp.read()
+        return _loads(self._state_blob)
+
+    def _apply_status(self, data, reset_on_deadcheckpoint=True):
+        # replaces previous state completely, its pending evictions included
+        self._checkpoints.clear()
+        self._checkpoints_view = None
+        self._evicted.clear()
+        for cp in data.pop('checkpoints', []):
+            self._push_checkpoint(cp)
+        self._add_checkpoint(data['checkpoint'], data)
+
+        # if checkpoint is not present - reset the checkpoint
+        if reset_on_deadcheckpoint and not _readable(self.current_checkpoint):
             self.reset()
 
+    def _discover_existing(self, ttl_seconds=None, before=None):
+        """
+        Add checkpoint files left in folder but missing from the status file to checkpoints
+        by their mtime, so they are rotated. Files older than `ttl_seconds` are removed instead.
+        Current checkpoint stays the most recent one.
+
+        :param before: timestamp, files modified at or after it are skipped
+        """
+        folder, file_name = os.path.split(self.checkpoint_path)
+        name_re = _template_regex(file_name)
+        known = set(self._checkpoints)
+        deadline = time.time() - ttl_seconds if ttl_seconds is not None else None
+        found = list()
+
+        try:
+            with os.scandir(folder or '.') as it:
+                for entry in it:
+                    if not name_re.fullmatch(entry.name) or not entry.is_file():
+                        continue
+                    path = os.path.join(folder, entry.name)
+                    if path in known:
+                        continue
+                    mtime = entry.stat().st_mtime
+                    if before is not None and mtime >= before:
+                        continue
+                    if deadline is not None and mtime < deadline:
+                        self._remove_checkpoint(path)
+                    else:
+                        found.append((mtime, path))
+        except FileNotFoundError:
+            return
+
+        if not found:
+            return
+        self._verbose('Found %d untracked checkpoints', len(found))
+        found.sort()
+        tracked = list(self._checkpoints)
+        current = tracked.pop() if tracked else None
+        self._checkpoints.clear()
+        i = 0
+        for cp in tracked:
+            try:
+                mtime = os.stat(cp).st_mtime
+            except OSError:
+                mtime = float('-inf')  # remote only, keeps its place after older found files
+            while i < len(found) and found[i][0] < mtime:
+                self._push_checkpoint(found[i][1])
+                i += 1
+            self._push_checkpoint(cp)
+        for _, path in found[i:]:
+            self._push_checkpoint(path)
+        if current:
+            self._push_checkpoint(current)
+
     def _save_current_status(self):
-        self.current_params['checkpoint'] = self.current_checkpoint
+        """
+        :return: True if status file was written, False if it's up to date
+        """
+        # checkpoints list is stored aside of current_params, not exposed to them
+        blob = _dumps({**self.current_params, 'checkpoints': self.checkpoints})
+        if blob == self._state_blob:
+            return False
 
-        with open(self.state_filepath, "w") as fp:
-            json.dump(self.current_params, fp)
+        # write aside and rename, so crash never leaves truncated state file behind
+        tmp_filepath = self.state_filepath + '.tmp'
+        try:
+            fp = open(tmp_filepath, "wb")
+        except FileNotFoundError:
+            # folder was removed after it had been prepared
+            _prepare_dir(os.path.dirname(tmp_filepath), force=True)
+            fp = open(tmp_filepath, "wb")
+
+        with fp:
+            fp.write(blob)
+            if self.fsync:
+                fp.flush()
+                _fdatasync(fp.fileno())
+        os.replace(tmp_filepath, self.state_filepath)
+        self._state_blob = blob
+        return True
 
     def _add_checkpoint(self, cp, params):
-        self.current_params = params
+        # own copy, caller's params dict is not modified
+        self.current_params = {**params, 'checkpoint': cp}
         self.current_checkpoint = cp
-        if self.current_checkpoint and (len(self.checkpoints) == 0 or self.checkpoints[-1] != self.current_checkpoint):
-            self.checkpoints.append(self.current_checkpoint)
+        # same checkpoint reported again (i.e. on restart) is not duplicated
+        if cp and (not self._checkpoints or self._checkpoints[-1] != cp):
+            self._push_checkpoint(cp)
 
-    def _verbose(self, string):
-        if self.verbose > 0: logger.debug(string)
+    def _push_checkpoint(self, cp):
+        if len(self._checkpoints) == self._checkpoints.maxlen:
+            self._evicted.append(self._checkpoints[0])
+        self._checkpoints.append(cp)
+        self._checkpoints_view = None
+
+    def _remove_checkpoint(self, file_path, rotate_fn=None):
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass  # already gone, nothing to report
+        except OSError as e:
+            logger.warning('cant remove file: %s', e, exc_info=e)
+            return
+        if rotate_fn:
+            rotate_fn(file_path)
+
+    def _rotate_executor(self):
+        if self._rotate_pool is None:
+            self._rotate_pool = ThreadPoolExecutor(max_workers=4)
+        return self._rotate_pool
+
+    def _release_checkpoint(self, file_path):
+        """
+        Called when checkpoint file is not going to be read anymore
+        """
+        _drop_pagecache(file_path)
+
+    def _verbose(self, msg, *args):
+        if self.verbose > 0: logger.debug(msg, *args)
 
 
 class FTPFileCheckpointsMonitor(FileCheckpointsMonitor):
@@ -222,6 +479,9 @@ class FTPFileCheckpointsMonitor(FileCheckpointsMonitor):
 
           FTP snapshots rotation strategy follows FileCheckpointsMonitor's
 
+          Remote state is fetched in background too, constructor returns immediately.
+          Use :py:meth:`wait_ready` before reading state, :py:meth:`close` when done.
+
     Public read-only properties:
         local_folder - local checkpoints storage dir
         remote_folder - remote checkpoints storage dir
@@ -241,7 +501,9 @@ class FTPFileCheckpointsMonitor(FileCheckpointsMonitor):
                  save_best_only=False,
                  save_weights_only=False,
                  mode='auto',
-                 period=1
+                 period=1,
+                 fsync=True,
+                 stale_ttl=None
                  ):
         """
         Setup files, folders and instance variables.
@@ -270,7 +532,10 @@ class FTPFileCheckpointsMonitor(FileCheckpointsMonitor):
 
         :param rotate_number: number of recent checkpoints to keep, -1 or 0 meaning keep all.
 
-        :param verbose: 0 - silent, 1 - print out key operations to STDOUT.
+        :param verbose: 0 - silent, 1 - log key operations to `sizif.storage` logger at DEBUG
+                level, shown only if application configures logging (i.e. logging.basicConfig),
+                and print transfers progress % to STDOUT.
+                FTP protocol trace is enabled by SIZIF_FTP_DEBUG env variable.
 
         :param monitor: quantity to monitor.
 
@@ -293,10 +558,17 @@ class FTPFileCheckpointsMonitor(FileCheckpointsMonitor):
 
         :param period: Interval (number of epochs) between checkpoints.
 
+        :param fsync: sync status file to disk on every save. False is faster, but status file
+                may be lost on OS crash or power failure (never truncated though).
+
+        :param stale_ttl: seconds, untracked checkpoint files older than that found in `folder`
+                on start are removed. Younger ones are added to checkpoints by modification time
+                and rotated as usual. None - never remove on start.
+
         """
 
         remote_folder = str(remote_folder).strip().strip('/\\')
-        self.remote_folder = '/' + re.sub(r'[/\\:;\s]+', '_', remote_folder)
+        self.remote_folder = '/' + _RE_PATHSEP.sub('_', remote_folder)
         self.host = host
         self.port = port
         self.login = login
@@ -304,39 +576,84 @@ class FTPFileCheckpointsMonitor(FileCheckpointsMonitor):
         self.threads_count = threads_count
         self.die_on_ftperrors = die_on_ftperrors
         self.executor = ThreadPoolExecutor(max_workers=threads_count)
+        # logged in connections reused by workers and state file uploads
+        self._ftp_pool = ftptasks.FTPConnectionPool()
+        # backpressure, training waits if network can't keep up with checkpoints
+        self._upload_slots = threading.BoundedSemaphore(FTP_UPLOAD_QUEUE_SIZE)
+        # checkpoints are uploaded one by one in order over single kept alive FTP session
+        if ftptasks_async:
+            # on aioftp event loop thread, transfers don't hold GIL while waiting for network
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._loop_thread.start()
+            # stops loop thread of monitor dropped without close()
+            self._loop_finalizer = weakref.finalize(self, self._loop.call_soon_threadsafe,
+                                                    self._loop.stop)
+            self._loop_finalizer.atexit = False  # _close_monitors() stops it on exit
+            self._upload_client = None
+            self._upload_lock = None  # asyncio.Lock, created on the loop
+        else:
+            self._loop = None
+            self._upload_executor = ThreadPoolExecutor(max_workers=1)
+        _open_monitors.add(self)
         # If self.thread_dead - some thread died with some error, call self.thread_result()
         # on main thread to raise exception
         self.thread_dead = False
         self.thread_result = None
+        self._bootstrap_future = None  # remote state fetch, see wait_ready()
+        self._bootstrap_thread = None
+        self._created = time.time()  # files modified later are written by this instance
 
         super().__init__(version, file_template, folder=local_folder, rotate_number=rotate_number,
                          monitor=monitor, verbose=verbose, save_best_only=save_best_only,
                          save_weights_only=save_weights_only,
-                         mode=mode, period=period)
-
-        # create remote folder if not exist
-        ftp = self.__getftp()
-        if not (self.remote_folder == ftp.pwd()
-                or self.ftp_direxist(ftp, self.remote_folder[1:])):
-            ftp.mkd(self.remote_folder)
+                         mode=mode, period=period, fsync=fsync, stale_ttl=stale_ttl)
+        # checkpoints are written under the same folder, remote name is the rest of the path
+        cp_folder = os.path.dirname(self.checkpoint_path)
+        self._cp_prefix = cp_folder + os.sep if cp_folder else ''
 
-        ftp.cwd(self.remote_folder)
+        # remote state is fetched in background, local state is used till it's ready
+        self._bootstrap_future = self.executor.submit(self.__bootstrap)
 
-        # download current statefile
-        if self.ftp_filexist(ftp, self.state_filename):
-            self.__ftp_download(self.state_filename, self.state_filepath, ftp=ftp)
+    def __bootstrap(self):
+        """
+        Fetch remote state file and recent checkpoint, replaces local state if found
+        """
+        self._bootstrap_thread = threading.get_ident()
+        # create remote folder if not exist, CWD probe instead of listing parent folder
+        ftp = self.__getftp()
+        try:
+            try:
+                ftp.cwd(self.remote_folder)
+            except ftplib.error_perm:
+                ftp.mkd(self.remote_folder)
+                ftp.cwd(self.remote_folder)
+
+            # download current statefile, local one is kept if download fails
+            if self.ftp_filexist(ftp, self.state_filename):
+                tmp_filepath = self.state_filepath + '.remote'
+                if self.__ftp_download(self.state_filename, tmp_filepath, ftp=ftp)[0]:
+                    os.replace(tmp_filepath, self.state_filepath)
+                else:
+                    os.unlink(tmp_filepath)
 
-        self._load_current_status(reset_on_deadcheckpoint=False)
+            try:
+                data = self._read_status()
+                checkpoint = data['checkpoint']
+            except Exception as e:
+                logger.exception('Error reading %s', self.state_filepath, exc_info=e)
+                self.reset()
+                return
 
-        # download recent checkpoint if needed
-        if self.current_checkpoint and not (os.path.isfile(self.current_checkpoint)
-                                            and os.access(self.current_checkpoint, os.R_OK)):
-            self.__ftp_download(os.path.basename(self.current_checkpoint),
-                                self.current_checkpoint,
-                                ftp=ftp)
+            # download recent checkpoint if needed
+            if checkpoint and not _readable(checkpoint):
+                self.__ftp_download(self._basename(checkpoint), checkpoint, ftp=ftp)
 
-        self._load_current_status()
-        ftp.close()
+            self._apply_status(data)
+            # checkpoints written after constructor are tracked already
+            self._discover_existing(self.stale_ttl, before=self._created)
+        finally:
+            ftp.close()
 
     # ---------------- PUBLIC interface --------------------------------------------
 
@@ -345,47 +662,127 @@ class FTPFileCheckpointsMonitor(FileCheckpointsMonitor):
         Adds new FTP upload task to background thread pool. Must be called after actual file
         is written to local FS.
 
-        :param params: additional params dict to save to `state_file` like epoch number,
+        :param params: additional params dict to save to `state_filepath` like epoch number,
                 val_loss etc.
         :raise: FileNotFoundError if file_path doesn't exist or not accessible
         """
+        self.wait_ready()
         self.__thread_check()
-        super().on_checkpoint_written(file_path, params)
+        state_changed = super().on_checkpoint_written(file_path, params)
 
-        # XXX: slow connections workaround upload state file synchronously
-        # important to have fresh statefile on remote server
-        upload_task(self.state_filepath, self.state_filename, remote_folder=self.remote_folder,
-                    host=self.host, port=self.port,
-                    login=self.login, password=self.password,
-                    die_on_ftperrors=True,
-                    verbose=self.verbose)
-        # self.__ftp_upload(self.state_filepath, self.state_filename)
-
-        # async upload of checkpoint
-        self.__ftp_upload(file_path, os.path.basename(file_path))
+        # async upload of checkpoint followed by state file if it has changed
+        self.__ftp_upload(file_path, self._basename(file_path), state_changed)
+        return state_changed
 
     def rotate_checkpoints(self, rotate_number=None, rotate_fn=None):
         """
         Removes all checkpoint files except recent `rotate_number` locally and from FTP
         :return: True if any actual local checkpoints were removed, False otherwise
         """
-        rotate_lambda = lambda filepath: self.__ftp_remove(os.path.basename(filepath))
-        return super().rotate_checkpoints(rotate_number=rotate_number, rotate_fn=rotate_lambda)
+        self.wait_ready()
+        return super().rotate_checkpoints(rotate_number=rotate_number,
+                                          rotate_fn=self._remove_remote)
+
+    def reset(self):
+        """
+        Clears all checkpoints and saves blank checkpoint status file, waits for remote state
+        fetch first so it doesn't override the reset.
+        """
+        self.wait_ready()
+        super().reset()
+
+    def wait_ready(self):
+        """
+        Block until remote state file and recent checkpoint are fetched.
+        If fetch failed local state is used, error is logged or raised once if
+        `die_on_ftperrors` is True.
+
+        :raise: exception of failed remote state fetch
+        """
+        # bootstrap itself may reset the state
+        if self._bootstrap_future and self._bootstrap_thread != threading.get_ident():
+            exception = self._bootstrap_future.exception()
+            self._bootstrap_future = None  # reported once
+            if exception:
+                if self.die_on_ftperrors:
+                    raise exception
+                logger.error('Remote state fetch failed, local state is used', exc_info=exception)
+
+    def close(self):
+        """
+        Wait for all background FTP operations to complete and release threads
+        """
+        _open_monitors.discard(self)
+        if not self._loop:
+            self._upload_executor.shutdown(wait=True)
+        elif not self._loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self.__close_upload_client(), self._loop).result()
+            self._loop_finalizer.detach()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+        self.executor.shutdown(wait=True)
+        self._ftp_pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     @staticmethod
     def ftp_direxist(ftp, folder):
-        return any((f[0] == folder and f[1]['type'] == 'dir') for f in ftp.mlsd())
+        """
+        CWD probe, no directory listing transfer. Current directory is restored.
+        """
+        pwd = ftp.pwd()
+        try:
+            ftp.cwd(folder)
+        except ftplib.error_perm:
+            return False
+        ftp.cwd(pwd)
+        return True
 
     @staticmethod
     def ftp_filexist(ftp, filename):
-        return filename in ftp.nlst()
+        """
+        SIZE probe, no directory listing transfer. Directories are reported as absent.
+        """
+        try:
+            ftp.voidcmd('TYPE I')  # some servers refuse SIZE in ASCII mode
+            ftp.sendcmd('SIZE ' + filename)
+            return True
+        except ftplib.error_perm:
+            return False
+
+    def _release_checkpoint(self, file_path):
+        pass  # checkpoint is still to be uploaded, dropped from page cache after upload
+
+    def _rotate_executor(self):
+        return self.executor
+
+    def _remove_remote(self, filepath):
+        """
+        Rotation callback, removes FTP copy of removed local checkpoint
+        """
+        self.__ftp_remove(self._basename(filepath))
+
+    def _basename(self, path):
+        """
+        :return: os.path.basename(path), sliced off known folder prefix for checkpoint paths
+        """
+        if path.startswith(self._cp_prefix):
+            name = path[len(self._cp_prefix):]
+            if os.sep not in name:
+                return name
+        return os.path.basename(path)
 
     def __getftp(self, remote_folder=None):
-        ftp = ftplib.FTP(timeout=ftptasks.FTP_OPERATION_TIMEOUT)
+        ftp = ftptasks.TunedFTP(timeout=ftptasks.FTP_OPERATION_TIMEOUT)
         ftp.connect(self.host, self.port)
         ftp.login(self.login, self.password)
         ftp.set_pasv(True)
-        ftp.set_debuglevel(self.verbose)
+        ftp.set_debuglevel(ftptasks.FTP_DEBUGLEVEL)
         if remote_folder:
             ftp.cwd(remote_folder)
         return ftp
@@ -394,45 +791,151 @@ class FTPFileCheckpointsMonitor(FileCheckpointsMonitor):
         return download_task(from_filename, to_filepath,
                              login=self.login, password=self.password,
                              remote_folder=self.remote_folder,
-                             verbose=self.verbose, ftp=ftp)
+                             verbose=self.verbose, ftp=ftp,
+                             blocksize=FTP_CHECKPOINT_BLOCKSIZE)
 
-    def __ftp_upload(self, from_filepath, to_filename):
+    def __ftp_upload(self, from_filepath, to_filename, upload_state=True):
         """
-        Async ftp file upload on new FTP connection
+        Async upload of checkpoint and then state file, queued in order to the single upload
+        thread reusing its FTP connection. Blocks if FTP_UPLOAD_QUEUE_SIZE uploads are pending.
+
+        State file is uploaded after the checkpoint, so remote state never refers to missing
+        checkpoint. It's skipped if newer checkpoint is written meanwhile - next upload has it.
         """
+        self._upload_slots.acquire()
+
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(
+                self.__ftp_upload_async(from_filepath, to_filename, upload_state), self._loop)
+            return
 
         def runner(*args, **kwargs):
             try:
-                upload_task(*args, **kwargs)
+                try:
+                    upload_task(from_filepath, to_filename, *args,
+                                blocksize=FTP_CHECKPOINT_BLOCKSIZE, **kwargs)
+                except FileNotFoundError:
+                    # rotated before its upload started, its remote remove is queued next
+                    self._verbose('Upload of removed %s skipped', from_filepath)
+                    return
+                _drop_pagecache(from_filepath)  # done reading it
+                if upload_state and self.current_checkpoint == from_filepath:
+                    upload_task(self.state_filepath, self.state_filename, *args, **kwargs)
             except BaseException as e:
                 self.thread_dead = True
                 self.thread_result = e
+            finally:
+                self._upload_slots.release()
+
+        self._upload_executor.submit(runner,
+                                     host=self.host, port=self.port,
+                                     login=self.login, password=self.password,
+                                     die_on_ftperrors=True,
+                                     remote_folder=self.remote_folder,
+                                     verbose=self.verbose,
+                                     pool=self._ftp_pool)
+
+    async def __ftp_upload_async(self, from_filepath, to_filename, upload_state=True):
+        """
+        Upload coroutine of :py:meth:`__ftp_upload`, uploads are serialized over the single
+        kept alive aioftp session
+        """
+        if self._upload_lock is None:
+            self._upload_lock = asyncio.Lock()
 
-        self.executor.submit(runner,
-                             from_filepath, to_filename,
-                             host=self.host, port=self.port,
-                             login=self.login, password=self.password,
-                             die_on_ftperrors=True,
-                             remote_folder=self.remote_folder,
-                             verbose=self.verbose)
+        async with self._upload_lock:
+            try:
+                await self.__connect_upload_client()
+                kwargs = dict(remote_folder=self.remote_folder,
+                              host=self.host, port=self.port,
+                              login=self.login, password=self.password,
+                              die_on_ftperrors=True,
+                              client=self._upload_client)
+                try:
+                    await ftptasks_async.upload_task_async(from_filepath, to_filename,
+                                                           blocksize=FTP_CHECKPOINT_BLOCKSIZE,
+                                                           **kwargs)
+                except FileNotFoundError:
+                    # rotated before its upload started, its remote remove is queued next
+                    self._verbose('Upload of removed %s skipped', from_filepath)
+                    return
+                _drop_pagecache(from_filepath)  # done reading it
+                if upload_state and self.current_checkpoint == from_filepath:
+                    await ftptasks_async.upload_task_async(self.state_filepath,
+                                                           self.state_filename, **kwargs)
+            except BaseException as e:
+                if self._upload_client:
+                    self._upload_client.close()
+                    self._upload_client = None  # reconnect on next upload
+                self.thread_dead = True
+                self.thread_result = e
+            finally:
+                self._upload_slots.release()
+
+    async def __connect_upload_client(self, check=False):
+        """
+        :param check: NOOP check of kept alive session, upload_task_async does it itself
+        """
+        if self._upload_client is None:
+            self._upload_client = await ftptasks_async.connect_async(
+                self.remote_folder, self.host, self.port, self.login, self.password)
+        elif check:
+            await ftptasks_async.reconnect_async(self._upload_client, self.remote_folder,
+                                                 self.host, self.port, self.login,
+                                                 self.password)
+
+    async def __close_upload_client(self):
+        if self._upload_lock:
+            async with self._upload_lock:  # queued uploads go first
+                pass
+        if self._upload_client:
+            self._upload_client.close()
+            self._upload_client = None
 
     def __ftp_remove(self, file_name):
         """
-        Async ftp file remove on new FTP connection
+        Async ftp file remove, queued to the single upload thread after pending uploads and
+        done on its FTP connection. So file is never removed before its upload is finished
+        and rotating many files doesn't open connection per file.
         """
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self.__ftp_remove_async(file_name), self._loop)
+            return
 
         def runner(fname):
             try:
-                logger.info(f'Removing {fname} from server')
-                ftp = self.__getftp(self.remote_folder)
-                ftp.delete(fname)
-                ftp.close()
+                logger.info('Removing %s from server', fname)
+                with self._ftp_pool.connection(self.remote_folder, self.host, self.port,
+                                               self.login, self.password,
+                                               self.verbose) as ftpw:
+                    ftpw.reconnect()
+                    ftpw.ftp.delete(fname)
+            except ftplib.error_perm as e:
+                logger.warning('Cant remove %s: %s', fname, e)  # i.e. it was never uploaded
             except BaseException as e:
-                logger.error(f'Cant remove {fname}', exc_info=e)
-                # self.thread_dead = True
-                # self.thread_result = e
+                logger.error('Cant remove %s', fname, exc_info=e)
+
+        self._upload_executor.submit(runner, file_name)
 
-        self.executor.submit(runner, file_name)
+    async def __ftp_remove_async(self, file_name):
+        """
+        Remove coroutine of :py:meth:`__ftp_remove`, serialized with uploads
+        """
+        if self._upload_lock is None:
+            self._upload_lock = asyncio.Lock()
+
+        async with self._upload_lock:
+            try:
+                logger.info('Removing %s from server', file_name)
+                await self.__connect_upload_client(check=True)
+                await self._upload_client.remove_file(file_name)
+            except ftptasks_async.aioftp.StatusCodeError as e:
+                logger.warning('Cant remove %s: %s', file_name, e)  # i.e. it was never uploaded
+            except BaseException as e:
+                logger.error('Cant remove %s', file_name, exc_info=e)
+                if self._upload_client:
+                    self._upload_client.close()
+                    self._upload_client = None  # reconnect on next upload
 
     def __thread_check(self):
         """
@@ -0,0 +1,81 @@
+import hashlib
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase, mock
+
+from sizif import ftptasks
+from sizif.ftptasks import FTP_PROGRESS_STEP, FTP_RETRY_COUNT, ProgressTracker, retry_delay
+
+
+class TestRetryDelay(TestCase):
+
+    def test_growth_and_cap(self):
+        with mock.patch('random.uniform', return_value=0):
+            self.assertEqual(ftptasks.FTP_RETRY_DELAY, retry_delay(FTP_RETRY_COUNT - 1))
+            self.assertEqual(ftptasks.FTP_RETRY_DELAY * ftptasks.FTP_RETRY_BASE,
+                             retry_delay(FTP_RETRY_COUNT - 2))
+
+            delays = [retry_delay(attempts) for attempts in range(FTP_RETRY_COUNT - 1, -50, -1)]
+            self.assertEqual(sorted(delays), delays)
+            self.assertEqual(ftptasks.FTP_RETRY_MAX_DELAY, delays[-1])
+
+    def test_jitter(self):
+        for _ in range(100):
+            delay = retry_delay(FTP_RETRY_COUNT - 1)
+            self.assertGreaterEqual(delay, ftptasks.FTP_RETRY_DELAY)
+            self.assertLess(delay, ftptasks.FTP_RETRY_DELAY + 0.5)
+
+
+class TestProgressTracker(TestCase):
+
+    def test_report_thresholds(self):
+        # large file, reported once per 1%
+        tracker = ProgressTracker(200 * FTP_PROGRESS_STEP)
+        self.assertEqual(2 * FTP_PROGRESS_STEP, tracker.step)
+        with mock.patch.object(tracker, 'report', wraps=tracker.report) as report:
+            block = b'\0' * FTP_PROGRESS_STEP
+            for _ in range(200):
+                tracker.handle(block)
+            self.assertEqual(100, report.call_count)
+        self.assertTrue(tracker.complete())
+        self.assertEqual(100, tracker.percent_complete)
+
+        # small file, reported once per FTP_PROGRESS_STEP and on completion
+        tracker = ProgressTracker(FTP_PROGRESS_STEP + 10, offset=10)
+        self.assertEqual(FTP_PROGRESS_STEP, tracker.step)
+        self.assertEqual(FTP_PROGRESS_STEP + 10, tracker.next_report)
+
+    def test_complete_printed_once(self):
+        tracker = ProgressTracker(3 * FTP_PROGRESS_STEP, verbose=1)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            for _ in range(3):
+                tracker.handle(b'\0' * FTP_PROGRESS_STEP)
+            tracker.handle(b'')
+        self.assertEqual(1, out.getvalue().count('100% complete'))
+        self.assertTrue(out.getvalue().endswith(
+            f'\r100% complete ({3 * FTP_PROGRESS_STEP} bytes processed)\n'))
+
+    def test_print_interval(self):
+        tracker = ProgressTracker(200 * FTP_PROGRESS_STEP, verbose=1)
+        out = io.StringIO()
+        with redirect_stdout(out), mock.patch('time.monotonic', return_value=1000.):
+            for _ in range(10):
+                tracker.handle(b'\0' * FTP_PROGRESS_STEP)
+        self.assertEqual('\r1%', out.getvalue())
+
+    def test_empty_file(self):
+        tracker = ProgressTracker(0, verbose=1)
+        self.assertTrue(tracker.complete())
+        self.assertEqual(100, tracker.percent_complete)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            tracker.handle(b'')
+            tracker.handle(b'')
+        self.assertEqual('\r100% complete (0 bytes processed)\n', out.getvalue())
+
+    def test_hasher(self):
+        tracker = ProgressTracker(6, hasher=hashlib.sha256())
+        tracker.handle(b'abc')
+        tracker.handle(b'def')
+        self.assertEqual(hashlib.sha256(b'abcdef').hexdigest(), tracker.hasher.hexdigest())
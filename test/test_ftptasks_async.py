@@ -0,0 +1,71 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import TestCase
+
+try:
+    from sizif import ftptasks_async
+except ImportError:
+    ftptasks_async = None  # aioftp is not installed
+
+try:
+    from pyftpdlib.authorizers import DummyAuthorizer
+    from pyftpdlib.handlers import FTPHandler
+    from pyftpdlib.servers import ThreadedFTPServer
+except ImportError:
+    ThreadedFTPServer = None
+
+
+@unittest.skipIf(ftptasks_async is None or ThreadedFTPServer is None,
+                 'aioftp and pyftpdlib are required')
+class TestUploadAsync(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.work = tempfile.mkdtemp()
+
+        authorizer = DummyAuthorizer()
+        authorizer.add_user('u', 'p', self.root, perm='elradfmwMT')
+        handler = type('Handler', (FTPHandler,), dict(authorizer=authorizer, timeout=1))
+        self.server = ThreadedFTPServer(('127.0.0.1', 0), handler)
+        self.port = self.server.address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.close_all()
+        shutil.rmtree(self.root)
+        shutil.rmtree(self.work)
+
+    def write(self, name, data):
+        path = os.path.join(self.work, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_upload_over_idle_dropped_session(self):
+        old, new = os.urandom(1000), os.urandom(1500)
+        kwargs = dict(remote_folder='/', host='127.0.0.1', port=self.port,
+                      login='u', password='p', die_on_ftperrors=True)
+
+        async def run():
+            client = await ftptasks_async.connect_async('/', '127.0.0.1', self.port, 'u', 'p')
+            try:
+                await ftptasks_async.upload_task_async(self.write('old', old), 'weights.h5',
+                                                       client=client, **kwargs)
+                await asyncio.sleep(2)  # server drops idle session
+                return await ftptasks_async.upload_task_async(self.write('new', new),
+                                                              'weights.h5',
+                                                              client=client, **kwargs)
+            finally:
+                client.close()
+
+        started = time.time()
+        self.assertEqual((True, None), asyncio.run(run()))
+        self.assertLess(time.time() - started, 10)  # reconnected without retry delay
+
+        with open(os.path.join(self.root, 'weights.h5'), 'rb') as f:
+            self.assertEqual(new, f.read())
@@ -23,7 +23,7 @@ class TestFileStorage(TestCase):
                                     verbose=1)
         self.assertEqual(fm.current_checkpoint, '')
         self.assertEqual(fm.current_params, {'checkpoint': ''})
-        self.assertEqual(fm.checkpoints, [])
+        self.assertEqual(list(fm.checkpoints), [])
         self.assertEqual(fm.rotate_number, -1)
         self.assertEqual(fm.verbose, 1)
         self.assertEqual(fm.state_filepath, 'votka/currentstate_24.json')
@@ -34,7 +34,7 @@ class TestFileStorage(TestCase):
 
     def test_writing_checkpoints_raise_error(self):
         fm = FileCheckpointsMonitor(version=0, file_template='hey.txt')
-        self.assertEqual(fm.checkpoints, [])
+        self.assertEqual(list(fm.checkpoints), [])
         with self.assertRaises(FileNotFoundError):
             fm.on_checkpoint_written(fm.checkpoint_path, {})
 
@@ -64,7 +64,7 @@ class TestFileStorage(TestCase):
         self.assertEqual(data['checkpoint'], fm.current_checkpoint)
 
         fm.reset()
-        self.assertEqual([], fm.checkpoints)
+        self.assertEqual([], list(fm.checkpoints))
 
         with open(fm.state_filepath, "r") as fp:
             data = json.load(fp)
@@ -77,7 +77,7 @@ class TestFileStorage(TestCase):
 
     def test_writing_checkpoints_autorotate(self):
         fm = FileCheckpointsMonitor(version=2, file_template='hey.txt', rotate_number=3)
-        self.assertEqual([], fm.checkpoints)
+        self.assertEqual([], list(fm.checkpoints))
 
         for i in range(2):
             fname = fm.checkpoint_path + str(i)
@@ -94,8 +94,137 @@ class TestFileStorage(TestCase):
 
         self.assertEqual(3, len(fm.checkpoints))
         self.assertEqual(fm.current_checkpoint, fm.checkpoint_path + '4')
+        with open(fm.state_filepath, "r") as fp:
+            self.assertEqual(list(fm.checkpoints), json.load(fp)['checkpoints'])
         self.assertFalse(os.path.exists(fm.checkpoint_path + '0'))
         self.assertFalse(os.path.exists(fm.checkpoint_path + '1'))
 
         # cleanup
         shutil.rmtree(os.path.dirname(fm.state_filepath))
+
+    def test_unchanged_state_not_rewritten(self):
+        fm = FileCheckpointsMonitor(version=3, file_template='hey.txt', rotate_number=3)
+        fname = fm.checkpoint_path + '0'
+        open(fname, 'w').close()
+
+        fm.on_checkpoint_written(fname, {'epoch': 1})
+        inode = os.stat(fm.state_filepath).st_ino
+        fm.on_checkpoint_written(fname, {'epoch': 1})
+        self.assertEqual(inode, os.stat(fm.state_filepath).st_ino)
+        self.assertEqual([fname], list(fm.checkpoints))
+
+        fm.on_checkpoint_written(fname, {'epoch': 2})
+        with open(fm.state_filepath, "r") as fp:
+            data = json.load(fp)
+        self.assertEqual(data['epoch'], 2)
+
+        # cleanup
+        shutil.rmtree(os.path.dirname(fm.state_filepath))
+
+    def test_rotate_previous_run(self):
+        fm = FileCheckpointsMonitor(version=4, file_template='hey.txt', rotate_number=2)
+        for i in range(2):
+            fname = fm.checkpoint_path + str(i)
+            open(fname, 'w').close()
+            fm.on_checkpoint_written(fname, {'epoch': i})
+
+        fm = FileCheckpointsMonitor(version=4, file_template='hey.txt', rotate_number=2)
+        self.assertEqual([fm.checkpoint_path + '0', fm.checkpoint_path + '1'],
+                         list(fm.checkpoints))
+        self.assertEqual({'checkpoint': fm.checkpoint_path + '1', 'epoch': 1}, fm.current_params)
+
+        fname = fm.checkpoint_path + '2'
+        open(fname, 'w').close()
+        fm.on_checkpoint_written(fname, {'epoch': 2})
+        self.assertFalse(os.path.exists(fm.checkpoint_path + '0'))
+        self.assertTrue(os.path.exists(fm.checkpoint_path + '1'))
+
+        # cleanup
+        shutil.rmtree(os.path.dirname(fm.state_filepath))
+
+    def test_rotate_untracked_files(self):
+        fm = FileCheckpointsMonitor(version=5, file_template='hey{epoch}.txt', rotate_number=2)
+        paths = [fm.checkpoint_path.format(epoch=i) for i in range(3)]
+        for path in paths[:2]:
+            open(path, 'w').close()
+        os.utime(paths[0], (0, 0))
+
+        # checkpoint files missing from status file
+        fm = FileCheckpointsMonitor(version=5, file_template='hey{epoch}.txt', rotate_number=2)
+        self.assertEqual(paths[:2], list(fm.checkpoints))
+
+        open(paths[2], 'w').close()
+        fm.on_checkpoint_written(paths[2], {'epoch': 2})
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertTrue(os.path.exists(paths[1]))
+
+        # stale files are removed on start
+        os.utime(paths[1], (0, 0))
+        os.remove(fm.state_filepath)
+        fm = FileCheckpointsMonitor(version=5, file_template='hey{epoch}.txt', rotate_number=2,
+                                    stale_ttl=3600)
+        self.assertFalse(os.path.exists(paths[1]))
+        self.assertEqual([paths[2]], list(fm.checkpoints))
+
+        # cleanup
+        shutil.rmtree(os.path.dirname(fm.state_filepath))
+
+    def test_untracked_files_of_other_version(self):
+        other = FileCheckpointsMonitor(version='6_v2', file_template='{epoch}.h5', rotate_number=2)
+        other_paths = [other.checkpoint_path.format(epoch=i) for i in range(2)]
+        for path in other_paths:
+            open(path, 'w').close()
+            other.on_checkpoint_written(path, {})
+
+        fm = FileCheckpointsMonitor(version=6, file_template='{epoch}.h5', rotate_number=1)
+        self.assertEqual([], list(fm.checkpoints))
+        for i in range(2):
+            path = fm.checkpoint_path.format(epoch=i)
+            open(path, 'w').close()
+            fm.on_checkpoint_written(path, {})
+        for path in other_paths:
+            self.assertTrue(os.path.exists(path))
+
+        # cleanup
+        shutil.rmtree(os.path.dirname(fm.state_filepath))
+
+    def test_apply_status_drops_pending_evictions(self):
+        fm = FileCheckpointsMonitor(version=7, file_template='hey{epoch}.txt', rotate_number=1)
+        paths = [fm.checkpoint_path.format(epoch=i) for i in range(2)]
+        for path in paths:
+            open(path, 'w').close()
+
+        # constructor found both files, the older one is pending rotation
+        fm = FileCheckpointsMonitor(version=7, file_template='hey{epoch}.txt', rotate_number=1)
+        self.assertEqual([paths[1]], list(fm.checkpoints))
+
+        # state applied later keeps the older file
+        fm._apply_status({'checkpoint': paths[0], 'checkpoints': [paths[0]]})
+        fm.rotate_checkpoints()
+        self.assertTrue(os.path.exists(paths[0]))
+        self.assertEqual([paths[0]], list(fm.checkpoints))
+
+        # cleanup
+        shutil.rmtree(os.path.dirname(fm.state_filepath))
+
+    def test_untracked_files_merged_by_mtime(self):
+        fm = FileCheckpointsMonitor(version=8, file_template='hey{epoch}.txt', rotate_number=-1)
+        paths = [fm.checkpoint_path.format(epoch=i) for i in range(5)]
+        for i, path in enumerate(paths):
+            open(path, 'w').close()
+            os.utime(path, (i * 100, i * 100))
+        os.utime(paths[3], (1000, 1000))  # newer than current checkpoint
+        fm._apply_status({'checkpoint': paths[2], 'checkpoints': [paths[0], paths[2]]})
+
+        # files modified at or after `before` are skipped
+        fm._discover_existing(before=400)
+        self.assertEqual([paths[0], paths[1], paths[2]], list(fm.checkpoints))
+
+        # current checkpoint stays the most recent one
+        fm._discover_existing()
+        self.assertEqual([paths[0], paths[1], paths[4], paths[3], paths[2]],
+                         list(fm.checkpoints))
+        self.assertEqual(paths[2], fm.current_checkpoint)
+
+        # cleanup
+        shutil.rmtree(os.path.dirname(fm.state_filepath))